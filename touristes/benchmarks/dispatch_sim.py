@@ -0,0 +1,125 @@
+"""
+Driver-matching simulator.
+
+Replays a city-sized fleet against dispatch.DriverIndex on one machine:
+location updates from every driver, then concurrent ride requests that claim
+the nearest driver. Reports update throughput, match latency percentiles and
+checks that no driver was claimed twice.
+
+    python benchmarks/dispatch_sim.py --drivers 20000 --updates 500000 --requests 20000 --threads 8
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dispatch
+
+# Greater Paris bounding box
+CITY_BOUNDS = (48.80, 48.91, 2.25, 2.42)
+
+
+def random_point(rng):
+    min_lat, max_lat, min_lon, max_lon = CITY_BOUNDS
+    return rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    return sorted_values[max(1, math.ceil(pct / 100 * len(sorted_values))) - 1]
+
+
+def run_in_threads(threads, target):
+    workers = [threading.Thread(target=target, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def simulate(drivers, updates, ride_requests, threads, cell_size_deg, max_radius_km, seed):
+    index = dispatch.DriverIndex(cell_size_deg=cell_size_deg)
+    rng = random.Random(seed)
+    positions = {f"driver-{i}": random_point(rng) for i in range(drivers)}
+    for driver_id, (lat, lon) in positions.items():
+        index.update_location(driver_id, lat, lon)
+
+    # Location updates: each driver drifts by up to ~200m per ping
+    driver_ids = list(positions)
+
+    def update_worker(worker):
+        local_rng = random.Random(seed + worker)
+        for _ in range(updates // threads):
+            driver_id = local_rng.choice(driver_ids)
+            lat, lon = positions[driver_id]
+            index.update_location(driver_id, lat + local_rng.uniform(-0.002, 0.002), lon + local_rng.uniform(-0.002, 0.002))
+
+    update_seconds = run_in_threads(threads, update_worker)
+
+    # Ride requests: claim the nearest driver, never releasing, so double claims would show
+    latencies = [[] for _ in range(threads)]
+    claims = [[] for _ in range(threads)]
+
+    def request_worker(worker):
+        local_rng = random.Random(seed * 31 + worker)
+        for _ in range(ride_requests // threads):
+            lat, lon = random_point(local_rng)
+            start = time.perf_counter()
+            match = index.claim_nearest(lat, lon, max_radius_km=max_radius_km)
+            latencies[worker].append(time.perf_counter() - start)
+            if match is not None:
+                claims[worker].append(match[1])
+
+    match_seconds = run_in_threads(threads, request_worker)
+
+    all_latencies = sorted(value for worker in latencies for value in worker)
+    all_claims = [driver_id for worker in claims for driver_id in worker]
+    to_us = lambda value: round(value * 1e6, 1) if value is not None else None
+    return {
+        "drivers": drivers,
+        "threads": threads,
+        "cell_size_deg": cell_size_deg,
+        "updates": (updates // threads) * threads,
+        "updates_per_second": round((updates // threads) * threads / update_seconds),
+        "requests": len(all_latencies),
+        "matched": len(all_claims),
+        "double_claims": len(all_claims) - len(set(all_claims)),
+        "matches_per_second": round(len(all_latencies) / match_seconds),
+        "match_p50_us": to_us(percentile(all_latencies, 50)),
+        "match_p95_us": to_us(percentile(all_latencies, 95)),
+        "match_p99_us": to_us(percentile(all_latencies, 99)),
+        "index": index.stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drivers", type=int, default=10000)
+    parser.add_argument("--updates", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--cell-size", type=float, default=0.01, help="Grid cell size in degrees")
+    parser.add_argument("--max-radius-km", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = simulate(args.drivers, args.updates, args.requests, args.threads, args.cell_size, args.max_radius_km, args.seed)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["double_claims"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
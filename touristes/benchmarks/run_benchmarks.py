@@ -0,0 +1,337 @@
+"""
+End-to-end benchmark and load test.
+
+Starts the app under uvicorn against a freshly seeded database and a stub
+exchange-rate server, drives each scenario at the requested concurrency
+levels, writes throughput and latency percentiles to a JSON results file and
+compares them with a stored baseline.
+
+    python benchmarks/run_benchmarks.py --scale 50 --concurrency 1,8,32
+    python benchmarks/run_benchmarks.py --save-baseline
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+import requests
+from sqlalchemy import create_engine, text
+
+from stub_exchange_rate import start_stub_server
+
+APP_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+CONTENTION_AVAILABILITY = 10_000_000
+
+INTERESTS = ['Culture', 'Ville', 'Plage', 'Aventure', 'Nature', 'Gastronomie', 'Shopping', 'Histoire']
+CLIMATES = ['Tempéré', 'Chaud', 'Froid', 'Désertique']
+CONTINENTS = ['Europe', 'Amerique du Nord', 'Asie', 'Oceanie', 'Afrique', 'Amerique du Sud']
+DESTINATION_TYPES = ['Megalopole', 'Historique', 'Ile']
+SEARCH_DESTINATIONS = ['Paris', 'New York', 'Tokyo']
+CURRENCIES = ['USD', 'EUR', 'GBP', 'JPY', 'MAD', 'CAD']
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def seed_database(env, database_url, scale):
+    subprocess.run([sys.executable, "init_db.py", str(scale)], cwd=APP_DIR, env=env, check=True)
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        # Every booking in the contention scenario targets this room
+        room_id = conn.execute(text("SELECT MIN(id) FROM rooms")).scalar()
+        conn.execute(text("UPDATE rooms SET availability = :n WHERE id = :id"), {"n": CONTENTION_AVAILABILITY, "id": room_id})
+    engine.dispose()
+    return room_id
+
+
+def start_app(env, app, port, startup_timeout):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=APP_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited during startup with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health/ready", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    # Not fully ready (e.g. model artifacts missing): report what we have
+    return process, base_url
+
+
+def create_users(base_url, run_id, count):
+    tokens = []
+    for i in range(count):
+        username = f"bench_{run_id}_{i}"
+        requests.post(f"{base_url}/signup/", json={"username": username, "email": f"{username}@bench.local", "password": "bench"}).raise_for_status()
+        response = requests.post(f"{base_url}/token", data={"username": username, "password": "bench"})
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+
+class Context:
+    def __init__(self, base_url, tokens, room_id, run_id):
+        self.base_url = base_url
+        self.tokens = tokens
+        self.room_id = room_id
+        self.run_id = run_id
+        self.counter = itertools.count()
+
+    def auth(self, worker):
+        return {"Authorization": f"Bearer {self.tokens[worker % len(self.tokens)]}"}
+
+
+def signup_token(session, ctx, worker):
+    username = f"load_{ctx.run_id}_{next(ctx.counter)}"
+    response = session.post(f"{ctx.base_url}/signup/", json={"username": username, "email": f"{username}@bench.local", "password": "bench"})
+    if response.status_code >= 400:
+        return response
+    return session.post(f"{ctx.base_url}/token", data={"username": username, "password": "bench"})
+
+
+def recommend(session, ctx, worker):
+    payload = {
+        "Age": random.randint(18, 70),
+        "Budget": random.randint(1000, 8000),
+        "Interet": random.choice(INTERESTS),
+        "Duree": random.randint(3, 21),
+        "Climat": random.choice(CLIMATES),
+        "Continent": random.choice(CONTINENTS),
+        "Type_Destination": random.choice(DESTINATION_TYPES),
+    }
+    return session.post(f"{ctx.base_url}/recommend/", json=payload, headers=ctx.auth(worker))
+
+
+def hotel_search(session, ctx, worker):
+    return session.get(f"{ctx.base_url}/api/hotels/search", params={"destination": random.choice(SEARCH_DESTINATIONS)})
+
+
+def booking_contention(session, ctx, worker):
+    start = date.today() + timedelta(days=random.randint(1, 365))
+    payload = {"room_id": ctx.room_id, "start_date": start.isoformat(), "end_date": (start + timedelta(days=3)).isoformat()}
+    return session.post(f"{ctx.base_url}/api/hotels/book", json=payload, headers=ctx.auth(worker))
+
+
+def currency_convert(session, ctx, worker):
+    from_currency, to_currency = random.sample(CURRENCIES, 2)
+    return session.get(f"{ctx.base_url}/api/currency/convert", params={"amount": 100, "from_currency": from_currency, "to_currency": to_currency})
+
+
+SCENARIOS = {
+    "signup_token": signup_token,
+    "recommend": recommend,
+    "hotel_search": hotel_search,
+    "booking_contention": booking_contention,
+    "currency_convert": currency_convert,
+}
+
+
+def run_scenario(name, ctx, concurrency, total_requests):
+    operation = SCENARIOS[name]
+    issued = itertools.count()
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        session = requests.Session()
+        local_latencies, local_errors = [], []
+        while next(issued) < total_requests:
+            start = time.perf_counter()
+            try:
+                response = operation(session, ctx, worker_id)
+                ok = response.status_code < 400
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            if ok:
+                local_latencies.append(elapsed)
+            else:
+                local_errors.append(elapsed)
+        with lock:
+            latencies.extend(local_latencies)
+            errors.extend(local_errors)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": to_ms(percentile(latencies, 50)),
+        "p95_ms": to_ms(percentile(latencies, 95)),
+        "p99_ms": to_ms(percentile(latencies, 99)),
+    }
+
+
+def compare_with_baseline(results, baseline, threshold, expected=()):
+    """
+    Returns a list of human-readable regressions beyond `threshold` (a fraction).
+
+    A result with no baseline entry, or a baseline entry among the `expected`
+    (scenario, concurrency) pairs that this run did not produce, is reported
+    too: a comparison that silently covers less than it claims is not a pass.
+    """
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    produced = {(r["scenario"], r["concurrency"]) for r in results}
+    regressions = []
+    for result in results:
+        label = f'{result["scenario"]}@{result["concurrency"]}'
+        base = previous.get((result["scenario"], result["concurrency"]))
+        if base is None:
+            regressions.append(f"{label}: not in the baseline; re-record it with --save-baseline")
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[key] and result[key] and result[key] > base[key] * (1 + threshold):
+                regressions.append(f"{label}: {key} {base[key]} -> {result[key]}")
+        if base["throughput_rps"] and result["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(f'{label}: throughput_rps {base["throughput_rps"]} -> {result["throughput_rps"]}')
+        if result["errors"] > base["errors"]:
+            regressions.append(f'{label}: errors {base["errors"]} -> {result["errors"]}')
+    for scenario, concurrency in sorted(set(expected) & set(previous) - produced):
+        regressions.append(f"{scenario}@{concurrency}: in the baseline but not measured in this run")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="PostgreSQL URL to benchmark against (default: a temporary SQLite file)")
+    parser.add_argument("--allow-drop", action="store_true", help="Allow init_db.py to drop and recreate every table in --database-url")
+    parser.add_argument("--scale", type=int, default=10, help="Number of copies of the init_db hotel catalog")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and concurrency level")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--app", default="main:app", help="ASGI app passed to uvicorn")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", default=str(BENCH_DIR / "results.json"))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression as a fraction of the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to the baseline file instead of comparing")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    run_id = str(int(time.time()))
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    scenarios = [name.strip() for name in args.scenarios.split(",")]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    if args.database_url and not args.allow_drop:
+        # init_db.py starts with drop_all: never wipe a database we did not create
+        sys.exit("Seeding drops every table in --database-url; pass --allow-drop to confirm.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        stub = start_stub_server()
+        env = dict(
+            os.environ,
+            DATABASE_URL=database_url,
+            EXCHANGE_RATE_API_KEY="bench",
+            EXCHANGE_RATE_API_URL=f"http://127.0.0.1:{stub.server_port}",
+        )
+
+        print(f"Seeding {database_url} at scale {args.scale}...")
+        room_id = seed_database(env, database_url, args.scale)
+
+        process, base_url = start_app(env, args.app, free_port(), args.startup_timeout)
+        try:
+            startup = requests.get(f"{base_url}/health/startup").json()
+            tokens = create_users(base_url, run_id, max(concurrency_levels))
+            ctx = Context(base_url, tokens, room_id, run_id)
+
+            results, skipped = [], []
+            for name in scenarios:
+                if name == "recommend" and startup["phases"]["models"]["status"] != "done":
+                    print("WARNING: skipping recommend: model artifacts did not load.", file=sys.stderr)
+                    skipped.append(name)
+                    continue
+                for concurrency in concurrency_levels:
+                    result = run_scenario(name, ctx, concurrency, args.requests)
+                    results.append(result)
+                    print(f'{name:>20} c={concurrency:<4} {result["throughput_rps"]:>9} req/s  '
+                          f'p50={result["p50_ms"]}ms p95={result["p95_ms"]}ms p99={result["p99_ms"]}ms errors={result["errors"]}')
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+            stub.shutdown()
+
+    report = {
+        "meta": {
+            "timestamp": run_id,
+            "database": "postgresql" if args.database_url else "sqlite",
+            "scale": args.scale,
+            "requests": args.requests,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "startup": startup,
+            "skipped": skipped,
+        },
+        "results": results,
+    }
+    if args.save_baseline and skipped:
+        # A baseline missing scenarios would let them regress unnoticed
+        print(f"Not saving a baseline without {', '.join(skipped)}.", file=sys.stderr)
+    output = args.baseline if args.save_baseline and not skipped else args.output
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.save_baseline:
+        return 1 if skipped else 0
+    if not Path(args.baseline).is_file():
+        print(f"No baseline at {args.baseline}; skipping regression check.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    expected = itertools.product(scenarios, concurrency_levels)
+    regressions = compare_with_baseline(results, baseline, args.threshold, expected)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
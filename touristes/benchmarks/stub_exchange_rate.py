@@ -0,0 +1,47 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A fixed subset of exchangerate-api.com's `latest/USD` payload
+CONVERSION_RATES = {
+    "USD": 1.0,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "JPY": 149.5,
+    "MAD": 10.05,
+    "CAD": 1.36,
+}
+
+
+class ExchangeRateHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # Path is /<api_key>/latest/USD, like the real API
+        if not self.path.endswith("/latest/USD"):
+            self.send_error(404)
+            return
+        body = json.dumps({"result": "success", "base_code": "USD", "conversion_rates": CONVERSION_RATES}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host="127.0.0.1", port=0):
+    """
+    Starts the stub exchange-rate server in a daemon thread.
+    Returns the server; its base URL is http://host:server.server_port.
+    """
+    server = ThreadingHTTPServer((host, port), ExchangeRateHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    server = start_stub_server(port=8099)
+    print(f"Stub exchange-rate server listening on http://127.0.0.1:{server.server_port}")
+    threading.Event().wait()
@@ -1,6 +1,8 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload, selectinload
 import schemas
 import database
+import metrics
 from security import get_password_hash
 
 # User CRUD
@@ -17,7 +19,14 @@ def create_user(db: Session, user: schemas.UserCreate):
 
 # Hotel and Booking CRUD
 def get_hotels_by_destination(db: Session, destination: str):
-    return db.query(database.Hotel).filter(database.Hotel.destination.ilike(f"%{destination}%")).all()
+    with metrics.stage("hotel_search_query"):
+        # Rooms come in one extra IN query instead of one lazy load per hotel
+        return (
+            db.query(database.Hotel)
+            .options(selectinload(database.Hotel.rooms))
+            .filter(database.Hotel.destination.ilike(f"%{destination}%"))
+            .all()
+        )
 
 def create_hotel(db: Session, hotel: schemas.HotelCreate):
     db_hotel = database.Hotel(**hotel.dict())
@@ -33,7 +42,8 @@ def get_room(db: Session, room_id: int):
 def create_booking(db: Session, user_id: int, booking: schemas.BookingCreate):
     # The transaction begins with the first query.
     # The `get_room` function now locks the selected room row.
-    db_room = get_room(db, room_id=booking.room_id)
+    with metrics.stage("booking_lock_room"):
+        db_room = get_room(db, room_id=booking.room_id)
 
     if not db_room:
         db.rollback() # Release the lock
@@ -56,7 +66,31 @@ def create_booking(db: Session, user_id: int, booking: schemas.BookingCreate):
 
     # Committing the session persists all changes (availability and new booking)
     # and releases the lock.
-    db.commit()
-    db.refresh(db_booking)
+    with metrics.stage("booking_commit"):
+        db.commit()
+        db.refresh(db_booking)
 
     return db_booking, None
+
+def get_user_bookings(db: Session, user_id: int, upcoming: bool, today, after=None, limit: int = 20):
+    """
+    One page of a user's bookings with their room and hotel, in a single query.
+    Upcoming bookings (not yet ended) are listed oldest first, past ones newest
+    first; `after` is the (start_date, id) of the last booking already returned.
+    """
+    Booking = database.Booking
+    query = (
+        db.query(Booking)
+        .options(joinedload(Booking.room).joinedload(database.Room.hotel))
+        .filter(Booking.user_id == user_id)
+    )
+    if upcoming:
+        query = query.filter(Booking.end_date >= today).order_by(Booking.start_date, Booking.id)
+        if after:
+            query = query.filter(or_(Booking.start_date > after[0], and_(Booking.start_date == after[0], Booking.id > after[1])))
+    else:
+        query = query.filter(Booking.end_date < today).order_by(Booking.start_date.desc(), Booking.id.desc())
+        if after:
+            query = query.filter(or_(Booking.start_date < after[0], and_(Booking.start_date == after[0], Booking.id < after[1])))
+    with metrics.stage("booking_history_query"):
+        return query.limit(limit).all()
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Date
+from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Date, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from dotenv import load_dotenv
@@ -29,6 +29,7 @@ class Hotel(Base):
     name = Column(String, index=True, nullable=False)
     destination = Column(String, index=True, nullable=False)
     rating = Column(Integer, nullable=False)
+    supplier_id = Column(String, unique=True, index=True)
     rooms = relationship("Room", back_populates="hotel")
 
 class Room(Base):
@@ -38,6 +39,7 @@ class Room(Base):
     room_type = Column(String, nullable=False)
     price = Column(Float, nullable=False)
     availability = Column(Integer, nullable=False)
+    supplier_id = Column(String, unique=True, index=True)
     hotel = relationship("Hotel", back_populates="rooms")
     bookings = relationship("Booking", back_populates="room")
 
@@ -50,6 +52,16 @@ class Booking(Base):
     end_date = Column(Date, nullable=False)
     user = relationship("User", back_populates="bookings")
     room = relationship("Room", back_populates="bookings")
+    __table_args__ = (
+        # Booking history: keyset scan per user on (start_date, id); on PostgreSQL the
+        # included columns let the scan and the upcoming/past filter skip the heap.
+        Index("ix_bookings_user_start_id", "user_id", "start_date", "id", postgresql_include=["end_date", "room_id"]),
+        # Upcoming bookings: seek straight to end_date >= today instead of walking
+        # the user's whole history from the oldest start_date; the few matches are sorted.
+        Index("ix_bookings_user_end", "user_id", "end_date", postgresql_include=["start_date", "room_id"]),
+        # Room lookups and availability checks by date
+        Index("ix_bookings_room_dates", "room_id", "start_date", "end_date"),
+    )
 
 class Destination(Base):
     __tablename__ = "destination"
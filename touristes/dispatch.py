@@ -0,0 +1,170 @@
+import math
+import threading
+import uuid
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+# Upper bound on the rings of cells one query scans. Near the poles cells get
+# so narrow that a 5 km radius would span hundreds of rings, all under the lock.
+MAX_SEARCH_RINGS = 64
+
+# Fare model: flat pickup charge plus a per-kilometre rate, with a minimum fare
+BASE_FARE = 2.50
+PER_KM_RATE = 1.20
+MINIMUM_FARE = 5.00
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def estimate_fare(distance_km):
+    return round(max(MINIMUM_FARE, BASE_FARE + PER_KM_RATE * distance_km), 2)
+
+
+class DriverIndex:
+    """
+    In-memory grid index of driver positions.
+
+    Drivers are bucketed into square cells of `cell_size_deg` degrees; only
+    available drivers are kept in the cells. Nearest-driver queries search
+    rings of cells outward from the rider's cell and stop as soon as no
+    unvisited cell can hold a closer driver. A single lock makes each update,
+    claim and completion atomic, so a driver can never be claimed twice.
+    Queries scan at most MAX_SEARCH_RINGS rings, which narrows the effective
+    radius only close to the poles.
+
+    The index lives in process memory: that guarantee, and the fleet itself,
+    only hold when a single process serves the taxi routes (one uvicorn
+    worker). Several workers would each see a different fleet.
+    """
+
+    def __init__(self, cell_size_deg=0.01):
+        self.cell_size_deg = cell_size_deg
+        self._lock = threading.Lock()
+        self._cells = {}
+        # driver_id -> [lat, lon, cell, ride_id]; ride_id is None while available
+        self._drivers = {}
+        # ride_id -> (driver_id, rider_id)
+        self._rides = {}
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_size_deg), math.floor(lon / self.cell_size_deg))
+
+    def update_location(self, driver_id, lat, lon):
+        cell = self._cell(lat, lon)
+        with self._lock:
+            driver = self._drivers.get(driver_id)
+            if driver is None:
+                self._drivers[driver_id] = [lat, lon, cell, None]
+                self._cells.setdefault(cell, set()).add(driver_id)
+                return
+            if driver[3] is None and driver[2] != cell:
+                self._discard(driver_id, driver[2])
+                self._cells.setdefault(cell, set()).add(driver_id)
+            driver[0], driver[1], driver[2] = lat, lon, cell
+
+    def remove_driver(self, driver_id):
+        with self._lock:
+            driver = self._drivers.pop(driver_id, None)
+            if driver is None:
+                return False
+            if driver[3] is None:
+                self._discard(driver_id, driver[2])
+            else:
+                del self._rides[driver[3]]
+            return True
+
+    def claim_nearest(self, lat, lon, max_radius_km=5.0, rider_id=None):
+        """
+        Atomically claims the closest available driver within `max_radius_km`
+        for a ride booked by `rider_id`.
+        Returns (ride_id, driver_id, distance_km), or None when nobody is in range.
+        """
+        center_row, center_col = self._cell(lat, lon)
+        # Smallest distance covered by one ring of cells at this latitude
+        ring_km = self.cell_size_deg * KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01)
+        max_ring = min(int(max_radius_km / ring_km) + 1, MAX_SEARCH_RINGS)
+
+        with self._lock:
+            best_id, best_km = None, None
+            for ring in range(max_ring + 1):
+                # Every driver outside the rings seen so far is at least this far away
+                if best_id is not None and best_km <= (ring - 1) * ring_km:
+                    break
+                for cell in self._ring_cells(center_row, center_col, ring):
+                    for driver_id in self._cells.get(cell, ()):
+                        driver = self._drivers[driver_id]
+                        distance = haversine_km(lat, lon, driver[0], driver[1])
+                        if distance <= max_radius_km and (best_km is None or distance < best_km):
+                            best_id, best_km = driver_id, distance
+            if best_id is None:
+                return None
+            ride_id = uuid.uuid4().hex
+            driver = self._drivers[best_id]
+            driver[3] = ride_id
+            self._rides[ride_id] = (best_id, rider_id)
+            self._discard(best_id, driver[2])
+            return ride_id, best_id, best_km
+
+    def complete_ride(self, ride_id, driver_id=None, lat=None, lon=None):
+        """
+        Ends a ride and makes its driver available again, optionally at a new
+        position. When `driver_id` is given the ride must be assigned to that
+        driver. Returns the driver id, or None when there is no such ride.
+        """
+        with self._lock:
+            ride = self._rides.get(ride_id)
+            if ride is None or (driver_id is not None and ride[0] != driver_id):
+                return None
+            return self._end_ride(ride_id, lat, lon)
+
+    def cancel_ride(self, ride_id, rider_id=None):
+        """
+        Cancels a ride and frees its driver where they are. When `rider_id` is
+        given the ride must have been booked by that rider. Returns the driver
+        id, or None when there is no such ride.
+        """
+        with self._lock:
+            ride = self._rides.get(ride_id)
+            if ride is None or (rider_id is not None and ride[1] != rider_id):
+                return None
+            return self._end_ride(ride_id)
+
+    def stats(self):
+        with self._lock:
+            available = sum(len(drivers) for drivers in self._cells.values())
+            return {"drivers": len(self._drivers), "available": available, "rides": len(self._rides), "cells": len(self._cells)}
+
+    def _end_ride(self, ride_id, lat=None, lon=None):
+        driver_id, _ = self._rides.pop(ride_id)
+        driver = self._drivers[driver_id]
+        if lat is not None and lon is not None:
+            driver[0], driver[1], driver[2] = lat, lon, self._cell(lat, lon)
+        driver[3] = None
+        self._cells.setdefault(driver[2], set()).add(driver_id)
+        return driver_id
+
+    def _discard(self, driver_id, cell):
+        drivers = self._cells.get(cell)
+        if drivers is not None:
+            drivers.discard(driver_id)
+            if not drivers:
+                del self._cells[cell]
+
+    @staticmethod
+    def _ring_cells(row, col, ring):
+        if ring == 0:
+            yield (row, col)
+            return
+        for dc in range(-ring, ring + 1):
+            yield (row - ring, col + dc)
+            yield (row + ring, col + dc)
+        for dr in range(-ring + 1, ring):
+            yield (row + dr, col - ring)
+            yield (row + dr, col + ring)
@@ -0,0 +1,257 @@
+"""
+Bulk hotel and room catalog ingestion.
+
+Reads an NDJSON or CSV supplier feed as a stream and upserts hotels and their
+rooms keyed on `supplier_id`, one multi-row INSERT ... ON CONFLICT statement
+per table and one commit per chunk, so memory stays bounded by the chunk size.
+
+NDJSON, one hotel per line:
+    {"supplier_id": "H1", "name": "...", "destination": "...", "rating": 4,
+     "rooms": [{"supplier_id": "H1-R1", "room_type": "...", "price": 120.0, "availability": 5}]}
+
+CSV, one room per row; consecutive rows with the same supplier_id form a hotel:
+    supplier_id,name,destination,rating,room_supplier_id,room_type,price,availability
+
+    python ingest.py feed.ndjson
+    python ingest.py feed.csv --chunk-size 2000
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+
+from pydantic import ValidationError
+from sqlalchemy import select
+
+import database
+import metrics
+import schemas
+
+CHUNK_SIZE = 1000
+# Rows per INSERT statement; keeps bound parameters under SQLite's limit
+UPSERT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+
+CSV_HOTEL_FIELDS = ['supplier_id', 'name', 'destination', 'rating']
+CSV_ROOM_FIELDS = {'room_supplier_id': 'supplier_id', 'room_type': 'room_type', 'price': 'price', 'availability': 'availability'}
+
+
+class RejectedRow:
+    """Yielded by a parser in place of a record it could not build."""
+
+    def __init__(self, reason):
+        self.reason = reason
+
+
+def parse_ndjson(lines):
+    """Yields (line_number, record) pairs; record is a RejectedRow for unparseable lines."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, RejectedRow("Malformed record.")
+
+
+def parse_csv(lines):
+    """
+    Yields (line_number, record) pairs, grouping consecutive rows of the same
+    hotel. Rows that disagree with their hotel's fields, or carry room data
+    without a room_supplier_id, are yielded as RejectedRow.
+    """
+    reader = csv.DictReader(lines)
+    current, current_line = None, None
+    for row in reader:
+        line_number = reader.line_num
+        hotel = {field: row.get(field) for field in CSV_HOTEL_FIELDS}
+        if current is None or hotel['supplier_id'] != current['supplier_id']:
+            if current is not None:
+                yield current_line, current
+            current = {**hotel, 'rooms': []}
+            current_line = line_number
+        elif any(hotel[field] != current[field] for field in CSV_HOTEL_FIELDS):
+            yield line_number, RejectedRow(f"Hotel fields differ from line {current_line} for the same supplier_id.")
+            continue
+
+        room = {target: row.get(source) for source, target in CSV_ROOM_FIELDS.items()}
+        if room['supplier_id']:
+            current['rooms'].append(room)
+        elif any(room.values()):
+            yield line_number, RejectedRow("Room fields without room_supplier_id.")
+    if current is not None:
+        yield current_line, current
+
+
+PARSERS = {'ndjson': parse_ndjson, 'csv': parse_csv}
+
+
+def _insert(db):
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Bulk upsert is not supported on {dialect}")
+    return insert
+
+
+def _upsert(db, model, rows):
+    """Upserts rows on supplier_id; returns ({supplier_id: id}, number of rows that already existed)."""
+    insert = _insert(db)
+    ids, existing = {}, 0
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[start:start + UPSERT_BATCH_SIZE]
+        supplier_ids = [row['supplier_id'] for row in batch]
+        existing += len(db.execute(select(model.supplier_id).where(model.supplier_id.in_(supplier_ids))).all())
+
+        stmt = insert(model).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['supplier_id'],
+            set_={column: stmt.excluded[column] for column in batch[0] if column != 'supplier_id'},
+        ).returning(model.id, model.supplier_id)
+        ids.update({supplier_id: id_ for id_, supplier_id in db.execute(stmt)})
+    return ids, existing
+
+
+class Ingestor:
+    def __init__(self, db, chunk_size=CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+        # Counts are table rows (hotels + rooms), so rejected rows add up with the written ones
+        self.stats = {'hotels_inserted': 0, 'hotels_updated': 0, 'rooms_inserted': 0, 'rooms_updated': 0, 'rows_rejected': 0}
+        self.errors = []
+        self._hotels = {}
+        self._room_ids = set()
+
+    def add(self, line_number, record):
+        if isinstance(record, RejectedRow):
+            self._reject(line_number, record.reason)
+            return
+        rows = 1 + len(record['rooms']) if isinstance(record, dict) and isinstance(record.get('rooms'), list) else 1
+        try:
+            hotel = schemas.HotelIngest(**record)
+        except ValidationError as e:
+            self._reject(line_number, "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()), rows)
+            return
+        except TypeError:
+            self._reject(line_number, "Record must be an object.")
+            return
+
+        room_ids = {room.supplier_id for room in hotel.rooms}
+        if len(room_ids) != len(hotel.rooms):
+            self._reject(line_number, "Duplicate room supplier_id within hotel.", rows)
+            return
+        # A repeated supplier id within one chunk would hit the same row twice in
+        # a single upsert statement, so apply what we have first
+        if hotel.supplier_id in self._hotels or room_ids & self._room_ids:
+            self.flush()
+        self._hotels[hotel.supplier_id] = (line_number, hotel)
+        self._room_ids |= room_ids
+        if len(self._hotels) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._hotels:
+            return
+        chunk = list(self._hotels.values())
+        self._hotels, self._room_ids = {}, set()
+        with metrics.stage("ingest_chunk"):
+            self._commit(chunk)
+
+    def _commit(self, chunk):
+        """
+        Writes a chunk in one transaction. If it fails, each half is retried on
+        its own, down to single hotels, so only the records that actually fail
+        are rejected.
+        """
+        try:
+            counts = self._write(chunk)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            if len(chunk) == 1:
+                line_number, hotel = chunk[0]
+                self._reject(line_number, f"Write failed: {e}".splitlines()[0], 1 + len(hotel.rooms))
+                return
+            middle = len(chunk) // 2
+            self._commit(chunk[:middle])
+            self._commit(chunk[middle:])
+            return
+        # Only counted once committed
+        for key, count in counts.items():
+            self.stats[key] += count
+
+    def _write(self, chunk):
+        hotel_rows = [hotel.dict(exclude={'rooms'}) for _, hotel in chunk]
+        hotel_ids, hotels_existing = _upsert(self.db, database.Hotel, hotel_rows)
+
+        room_rows = [
+            {**room.dict(), 'hotel_id': hotel_ids[hotel.supplier_id]}
+            for _, hotel in chunk
+            for room in hotel.rooms
+        ]
+        rooms_existing = 0
+        if room_rows:
+            _, rooms_existing = _upsert(self.db, database.Room, room_rows)
+
+        return {
+            'hotels_inserted': len(hotel_rows) - hotels_existing,
+            'hotels_updated': hotels_existing,
+            'rooms_inserted': len(room_rows) - rooms_existing,
+            'rooms_updated': rooms_existing,
+        }
+
+    def _reject(self, line_number, reason, rows=1):
+        self.stats['rows_rejected'] += rows
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'rows': rows, 'error': reason})
+
+
+def ingest_stream(db, lines, fmt='ndjson', chunk_size=CHUNK_SIZE):
+    """Ingests an iterable of text lines in the given format and returns the run report."""
+    if fmt not in PARSERS:
+        raise ValueError(f"Unsupported format {fmt!r}; expected one of {', '.join(PARSERS)}")
+    ingestor = Ingestor(db, chunk_size=chunk_size)
+    start = time.perf_counter()
+    for line_number, record in PARSERS[fmt](lines):
+        ingestor.add(line_number, record)
+    ingestor.flush()
+    seconds = time.perf_counter() - start
+
+    stats = ingestor.stats
+    rows = sum(stats[key] for key in ('hotels_inserted', 'hotels_updated', 'rooms_inserted', 'rooms_updated'))
+    return {
+        **stats,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds, 1) if seconds else None,
+        'errors': ingestor.errors,
+    }
+
+
+def detect_format(filename):
+    if filename and filename.lower().endswith('.csv'):
+        return 'csv'
+    return 'ndjson'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help="Feed file, or - for stdin")
+    parser.add_argument('--format', choices=sorted(PARSERS), help="Defaults to csv for .csv files, ndjson otherwise")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    db = database.SessionLocal()
+    try:
+        if args.path == '-':
+            report = ingest_stream(db, sys.stdin, fmt, args.chunk_size)
+        else:
+            with open(args.path, newline='', encoding='utf-8') as f:
+                report = ingest_stream(db, f, fmt, args.chunk_size)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
@@ -2,7 +2,7 @@ import pandas as pd
 from database import Base, engine, SessionLocal
 from database import Hotel, Room, Destination, TourismeData
 
-def init_db():
+def init_db(scale=1):
     # Drop and recreate all tables
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -48,30 +48,33 @@ def init_db():
 
 
         # --- Populate Hotel Test Data ---
-        hotel1 = Hotel(name="Grand Hyatt", destination="Paris", rating=5)
-        hotel2 = Hotel(name="The Ritz-Carlton", destination="Paris", rating=5)
-        hotel3 = Hotel(name="Holiday Inn", destination="New York", rating=4)
-        hotel4 = Hotel(name="Marriott", destination="New York", rating=4)
-        hotel5 = Hotel(name="Hotel Shibuya", destination="Tokyo", rating=4)
+        # `scale` repeats the test catalog so benchmarks can run against a larger one
+        for batch in range(scale):
+            suffix = f" #{batch + 1}" if batch else ""
+            hotel1 = Hotel(name="Grand Hyatt" + suffix, destination="Paris", rating=5)
+            hotel2 = Hotel(name="The Ritz-Carlton" + suffix, destination="Paris", rating=5)
+            hotel3 = Hotel(name="Holiday Inn" + suffix, destination="New York", rating=4)
+            hotel4 = Hotel(name="Marriott" + suffix, destination="New York", rating=4)
+            hotel5 = Hotel(name="Hotel Shibuya" + suffix, destination="Tokyo", rating=4)
 
-        db.add_all([hotel1, hotel2, hotel3, hotel4, hotel5])
-        db.commit()
+            db.add_all([hotel1, hotel2, hotel3, hotel4, hotel5])
+            db.flush()
 
-        # Create Rooms for each hotel
-        room1_1 = Room(hotel_id=hotel1.id, room_type="Standard", price=250.0, availability=10)
-        room1_2 = Room(hotel_id=hotel1.id, room_type="Suite", price=500.0, availability=5)
+            # Create Rooms for each hotel
+            room1_1 = Room(hotel_id=hotel1.id, room_type="Standard", price=250.0, availability=10)
+            room1_2 = Room(hotel_id=hotel1.id, room_type="Suite", price=500.0, availability=5)
 
-        room2_1 = Room(hotel_id=hotel2.id, room_type="Deluxe", price=800.0, availability=3)
+            room2_1 = Room(hotel_id=hotel2.id, room_type="Deluxe", price=800.0, availability=3)
 
-        room3_1 = Room(hotel_id=hotel3.id, room_type="Standard", price=150.0, availability=20)
-        room3_2 = Room(hotel_id=hotel3.id, room_type="Queen", price=200.0, availability=15)
+            room3_1 = Room(hotel_id=hotel3.id, room_type="Standard", price=150.0, availability=20)
+            room3_2 = Room(hotel_id=hotel3.id, room_type="Queen", price=200.0, availability=15)
 
-        room4_1 = Room(hotel_id=hotel4.id, room_type="King", price=220.0, availability=18)
+            room4_1 = Room(hotel_id=hotel4.id, room_type="King", price=220.0, availability=18)
 
-        room5_1 = Room(hotel_id=hotel5.id, room_type="Capsule", price=80.0, availability=30)
-        room5_2 = Room(hotel_id=hotel5.id, room_type="Double", price=120.0, availability=12)
+            room5_1 = Room(hotel_id=hotel5.id, room_type="Capsule", price=80.0, availability=30)
+            room5_2 = Room(hotel_id=hotel5.id, room_type="Double", price=120.0, availability=12)
 
-        db.add_all([room1_1, room1_2, room2_1, room3_1, room3_2, room4_1, room5_1, room5_2])
+            db.add_all([room1_1, room1_2, room2_1, room3_1, room3_2, room4_1, room5_1, room5_2])
         db.commit()
         print("Hotel test data populated.")
 
@@ -81,4 +84,5 @@ def init_db():
         db.close()
 
 if __name__ == "__main__":
-    init_db()
+    import sys
+    init_db(scale=int(sys.argv[1]) if len(sys.argv) > 1 else 1)
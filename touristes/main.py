@@ -1,21 +1,98 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Request
 from fastapi.templating import Jinja2Templates
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.responses import FileResponse
-from jose import jwt, JWTError
-import pandas as pd
-import joblib
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from sqlalchemy.orm import Session
 from pathlib import Path
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import math
+import os
+import time
+
+import crud, database, metrics, schemas, security
+from database import engine
+from deps import get_db, get_current_user
+from startup import StartupProfile, FAILED
+from routers import hotels, taxis, currency
+
+logger = logging.getLogger(__name__)
+
+# Heavy modules (pandas, joblib/sklearn, jose) are imported lazily so the app
+# can answer health checks and serve non-ML routes while they load.
+startup_profile = StartupProfile(["schema", "models"])
+ml_models = {}
+
+def create_schema():
+    database.Base.metadata.create_all(bind=engine)
+
+def load_models():
+    import io
+    import joblib
+    import recommendation_table
+    model_bytes = Path(recommendation_table.MODEL_PATH).read_bytes()
+    loaded = {
+        'model': joblib.load(io.BytesIO(model_bytes)),
+        'preprocessor': joblib.load('preprocessor.joblib'),
+        'label_encoder': joblib.load('label_encoder.joblib'),
+    }
+    # Optional precomputed table (model_training.py --lookup-table)
+    if Path(recommendation_table.DEFAULT_TABLE_PATH).is_file():
+        table = recommendation_table.RecommendationTable.load()
+        # A table built from another model or label encoder would serve stale or wrong destinations
+        fingerprint_matches = table.model_fingerprint == recommendation_table.model_fingerprint(model_bytes)
+        if fingerprint_matches and list(table.classes) == [str(c) for c in loaded['label_encoder'].classes_]:
+            loaded['table'] = table
+        else:
+            logger.warning("Ignoring %s: it was built from a different model", recommendation_table.DEFAULT_TABLE_PATH)
+    # Publish everything at once so requests never see a partial set
+    ml_models.update(loaded)
+
+async def run_startup_phases():
+    db_retries = int(os.environ.get('STARTUP_DB_RETRIES', '10'))
+    await asyncio.gather(
+        asyncio.to_thread(startup_profile.run, "schema", create_schema, retries=db_retries),
+        asyncio.to_thread(startup_profile.run, "models", load_models),
+    )
 
-import crud, database, schemas, security
-from database import SessionLocal, engine
-from .routers import hotels, taxis, currency
-
-# Create all tables
-database.Base.metadata.create_all(bind=engine)
-
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup_task = asyncio.create_task(run_startup_phases())
+    yield
+    startup_task.cancel()
+
+app = FastAPI(lifespan=lifespan)
+
+metrics.instrument_engine(engine)
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    # The default handler echoes each invalid input back, and NaN or infinity
+    # (which Python's json accepts) cannot be encoded in the response
+    def json_safe(value):
+        return str(value) if isinstance(value, float) and not math.isfinite(value) else value
+    errors = [{**error, "input": json_safe(error["input"])} if "input" in error else error for error in exc.errors()]
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
+
+@app.middleware("http")
+async def record_request_timings(request: Request, call_next):
+    timings = metrics.begin_request()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        # Unhandled errors become a 500 further out; count them before they leave
+        route = request.scope.get("route")
+        metrics.finish_request(timings, route.path if route else "unmatched", request.method, 500, time.perf_counter() - start)
+        raise
+    elapsed = time.perf_counter() - start
+    route = request.scope.get("route")
+    metrics.finish_request(timings, route.path if route else "unmatched", request.method, response.status_code, elapsed)
+    response.headers["Server-Timing"] = metrics.server_timing(timings, elapsed)
+    return response
 
 # Include routers
 app.include_router(hotels.router)
@@ -23,42 +100,8 @@ app.include_router(taxis.router)
 app.include_router(currency.router)
 
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-# Load models
-model = joblib.load('recommendation_model.joblib')
-preprocessor = joblib.load('preprocessor.joblib')
-label_encoder = joblib.load('label_encoder.joblib')
-
 templates = Jinja2Templates(directory="templates")
 
-# Dependency to get the DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, security.SECRET_KEY, algorithms=[security.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = schemas.TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
-    user = crud.get_user_by_username(db, username=token_data.username)
-    if user is None:
-        raise credentials_exception
-    return user
-
 @app.post("/signup/", response_model=schemas.User)
 def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db_user = crud.get_user_by_username(db, username=user.username)
@@ -82,48 +125,94 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
 
 @app.post("/recommend/")
 def recommend(request: Request, rec_request: schemas.RecommendationRequest, current_user: database.User = Depends(get_current_user)):
+    if startup_profile.status("models") == FAILED:
+        # Retrying will not help until the artifacts are fixed and the app restarted
+        raise HTTPException(status_code=503, detail="Recommendation model failed to load.")
+    if not startup_profile.is_done("models"):
+        raise HTTPException(status_code=503, detail="Recommendation model is still loading.", headers={"Retry-After": "5"})
     try:
-        features = {
-            'Age': [rec_request.Age],
-            'Budget': [rec_request.Budget],
-            'Interet': [rec_request.Interet],
-            'Duree': [rec_request.Duree],
-            'Climat': [rec_request.Climat],
-            'Continent': [rec_request.Continent],
-            'Cout_de_la_Vie': [3.3], # Placeholder value
-            'Type_Destination': [rec_request.Type_Destination]
-        }
-        input_df = pd.DataFrame(features)
-        input_processed = preprocessor.transform(input_df)
-        prediction_encoded = model.predict(input_processed)
-        prediction = label_encoder.inverse_transform(prediction_encoded)
-        
-        return templates.TemplateResponse("_recommendation_result.html", {"request": request, "recommendation": prediction[0]})
+        recommendation = None
+        table = ml_models.get('table')
+        if table is not None:
+            with metrics.stage("table_lookup"):
+                recommendation = table.lookup(rec_request)
+            metrics.record_cache("recommendation_table", hit=recommendation is not None)
+
+        # Inputs outside the precomputed grid go through the live model
+        if recommendation is None:
+            import pandas as pd
+            import recommendation_table
+            with metrics.stage("build_frame"):
+                features = {
+                    'Age': [rec_request.Age],
+                    'Budget': [rec_request.Budget],
+                    'Interet': [rec_request.Interet],
+                    'Duree': [rec_request.Duree],
+                    'Climat': [rec_request.Climat],
+                    'Continent': [rec_request.Continent],
+                    'Cout_de_la_Vie': [recommendation_table.COST_OF_LIVING_PLACEHOLDER],
+                    'Type_Destination': [rec_request.Type_Destination]
+                }
+                input_df = pd.DataFrame(features)[recommendation_table.FEATURE_COLUMNS]
+            with metrics.stage("preprocess"):
+                input_processed = ml_models['preprocessor'].transform(input_df)
+            with metrics.stage("predict"):
+                prediction_encoded = ml_models['model'].predict(input_processed)
+            with metrics.stage("decode"):
+                prediction = ml_models['label_encoder'].inverse_transform(prediction_encoded)
+            recommendation = prediction[0]
+
+        with metrics.stage("render"):
+            return templates.TemplateResponse(request, "_recommendation_result.html", {"recommendation": recommendation})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Health endpoints
+@app.get("/health/live")
+def liveness():
+    phases = {name: state["status"] for name, state in startup_profile.report()["phases"].items()}
+    # A failed phase is never retried in this process; ask to be restarted
+    if any(status == FAILED for status in phases.values()):
+        return JSONResponse(status_code=503, content={"status": "failed", "phases": phases})
+    return {"status": "alive", "phases": phases}
+
+@app.get("/health/ready")
+def readiness():
+    phases = {name: state["status"] for name, state in startup_profile.report()["phases"].items()}
+    if any(status != "done" for status in phases.values()):
+        return JSONResponse(status_code=503, content={"status": "not ready", "phases": phases})
+    return {"status": "ready", "phases": phases}
+
+@app.get("/health/startup")
+def startup_report():
+    return startup_profile.report()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Page serving endpoints
 @app.get("/")
 def home(request: Request):
     continents = ['Europe', 'Amerique du Nord', 'Asie', 'Oceanie', 'Afrique', 'Amerique du Sud']
     destination_types = ['Megalopole', 'Historique', 'Ile']
-    return templates.TemplateResponse("index.html", {"request": request, "continents": continents, "destination_types": destination_types})
+    return templates.TemplateResponse(request, "index.html", {"continents": continents, "destination_types": destination_types})
 
 @app.get("/login")
 def login(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+    return templates.TemplateResponse(request, "login.html")
 
 @app.get("/hotels")
 def hotels_page(request: Request):
-    return templates.TemplateResponse("hotels.html", {"request": request})
+    return templates.TemplateResponse(request, "hotels.html")
 
 @app.get("/currency")
 def currency_page(request: Request):
-    return templates.TemplateResponse("currency_converter.html", {"request": request})
+    return templates.TemplateResponse(request, "currency_converter.html")
 
 @app.get("/taxis")
 def taxis_page(request: Request):
-    return templates.TemplateResponse("taxis.html", {"request": request})
+    return templates.TemplateResponse(request, "taxis.html")
 
 # Locale endpoint
 @app.get("/locales/{lng}.json")
@@ -0,0 +1,163 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Per-request timings, set by the HTTP middleware and filled in by `stage`
+# and the SQLAlchemy listeners. None outside of a request.
+_request_timings = ContextVar("request_timings", default=None)
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self):
+        with self._lock:
+            return dict(self._values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts plus one overflow slot for +Inf
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram("app_request_duration_seconds", "HTTP request latency by route.")
+STAGE_SECONDS = Histogram("app_stage_duration_seconds", "Latency of instrumented hot-path stages.")
+DB_QUERY_SECONDS = Histogram("app_db_query_duration_seconds", "Latency of individual SQL statements.")
+DB_QUERIES_PER_REQUEST = Histogram("app_db_queries_per_request", "SQL statements executed per HTTP request.", buckets=COUNT_BUCKETS)
+CACHE_REQUESTS = Counter("app_cache_requests_total", "Cache lookups by cache and result (hit or miss).")
+
+REGISTRY = [REQUEST_SECONDS, STAGE_SECONDS, DB_QUERY_SECONDS, DB_QUERIES_PER_REQUEST, CACHE_REQUESTS]
+
+
+@contextmanager
+def stage(name):
+    """Times a block, recording it in the stage histogram and the current request's Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings["stages"][name] = timings["stages"].get(name, 0.0) + elapsed
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def begin_request():
+    # A mutable dict is shared with the endpoint's context copy (threadpool or task)
+    timings = {"stages": {}, "db_queries": 0, "db_seconds": 0.0}
+    _request_timings.set(timings)
+    return timings
+
+
+def finish_request(timings, route, method, status_code, elapsed):
+    REQUEST_SECONDS.observe(elapsed, route=route, method=method, status=status_code)
+    DB_QUERIES_PER_REQUEST.observe(timings["db_queries"], route=route)
+
+
+def server_timing(timings, elapsed):
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings["stages"].items()]
+    if timings["db_queries"]:
+        entries.append(f'db;dur={timings["db_seconds"] * 1000:.2f};desc="{timings["db_queries"]} queries"')
+    entries.append(f"total;dur={elapsed * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def instrument_engine(engine):
+    """Counts and times every SQL statement executed through `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_times"].pop()
+        DB_QUERY_SECONDS.observe(elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings["db_queries"] += 1
+            timings["db_seconds"] += elapsed
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+
+    lines.append("# HELP app_cache_hit_ratio Fraction of cache lookups that were hits.")
+    lines.append("# TYPE app_cache_hit_ratio gauge")
+    totals = {}
+    for key, value in CACHE_REQUESTS.values().items():
+        labels = dict(key)
+        hits, lookups = totals.get(labels["cache"], (0, 0))
+        totals[labels["cache"]] = (hits + (value if labels["result"] == "hit" else 0), lookups + value)
+    for cache, (hits, lookups) in sorted(totals.items()):
+        lines.append(f'app_cache_hit_ratio{{cache="{cache}"}} {hits / lookups:.6f}')
+    return "\n".join(lines) + "\n"
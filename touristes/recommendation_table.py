@@ -0,0 +1,201 @@
+import hashlib
+import json
+import math
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+# Same values the app offers or the dataset was generated from
+INTERESTS = ['Culture', 'Ville', 'Plage', 'Aventure', 'Nature', 'Gastronomie', 'Shopping', 'Histoire']
+CLIMATES = ['Tempéré', 'Chaud', 'Froid', 'Désertique']
+CONTINENTS = ['Europe', 'Amerique du Nord', 'Asie', 'Oceanie', 'Afrique', 'Amerique du Sud']
+DESTINATION_TYPES = ['Megalopole', 'Historique', 'Ile']
+
+# Cost of living sent with every request; /recommend/ does not know the destination yet
+COST_OF_LIVING_PLACEHOLDER = 3.3
+
+# Model input columns, shared by model_training, main.recommend and the table build
+FEATURE_COLUMNS = ['Age', 'Budget', 'Interet', 'Duree', 'Climat', 'Continent', 'Cout_de_la_Vie', 'Type_Destination']
+
+DEFAULT_TABLE_PATH = 'recommendation_table.npz'
+MODEL_PATH = 'recommendation_model.joblib'
+
+
+def model_fingerprint(data):
+    """Hash of the serialized model the table was built from."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class CategoricalAxis:
+    def __init__(self, name, values):
+        self.name = name
+        self.values = list(values)
+        self._positions = {value: i for i, value in enumerate(self.values)}
+
+    def __len__(self):
+        return len(self.values)
+
+    def index(self, value):
+        return self._positions.get(value)
+
+    def materialize(self, indices):
+        return np.asarray(self.values, dtype=object)[indices]
+
+    def to_dict(self):
+        return {"name": self.name, "values": self.values}
+
+
+class NumericAxis:
+    """
+    Evenly spaced values from `start` to `stop` inclusive. Inputs inside that
+    range snap to the nearest grid value, halfway points rounding up; inputs
+    outside it have no position.
+    """
+
+    def __init__(self, name, start, stop, step=1):
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.step = step
+        self._size = (stop - start) // step + 1
+
+    def __len__(self):
+        return self._size
+
+    def index(self, value):
+        if not self.start <= value <= self.stop:
+            return None
+        # Clamp for a `stop` that is not itself on the grid
+        return min(math.floor((value - self.start) / self.step + 0.5), self._size - 1)
+
+    def materialize(self, indices):
+        return self.start + indices * self.step
+
+    def to_dict(self):
+        return {"name": self.name, "start": self.start, "stop": self.stop, "step": self.step}
+
+
+def axis_from_dict(data):
+    if "values" in data:
+        return CategoricalAxis(data["name"], data["values"])
+    return NumericAxis(data["name"], data["start"], data["stop"], data["step"])
+
+
+def default_axes(age_step=1, duration_step=1, budget_step=500):
+    return [
+        CategoricalAxis('Interet', INTERESTS),
+        CategoricalAxis('Climat', CLIMATES),
+        CategoricalAxis('Continent', CONTINENTS),
+        CategoricalAxis('Type_Destination', DESTINATION_TYPES),
+        NumericAxis('Age', 18, 70, age_step),
+        NumericAxis('Duree', 3, 21, duration_step),
+        NumericAxis('Budget', 1000, 8000, budget_step),
+    ]
+
+
+class RecommendationTable:
+    """
+    Precomputed predictions over the whole discrete input space.
+
+    `codes` is a flat array of label-encoded destinations laid out in C order
+    over `axes`, so a request is served by computing its flat index.
+    """
+
+    def __init__(self, axes, codes, classes, model_fingerprint=None):
+        self.axes = axes
+        self.codes = codes
+        self.classes = np.asarray(classes)
+        self.model_fingerprint = model_fingerprint
+        self.shape = tuple(len(axis) for axis in axes)
+        self._strides = [int(np.prod(self.shape[i + 1:])) for i in range(len(self.shape))]
+
+    @property
+    def size(self):
+        return int(self.codes.size)
+
+    @property
+    def nbytes(self):
+        return int(self.codes.nbytes)
+
+    def lookup(self, rec_request):
+        """Returns the recommended destination, or None when the input is outside the grid."""
+        flat = 0
+        for axis, stride in zip(self.axes, self._strides):
+            position = axis.index(getattr(rec_request, axis.name))
+            if position is None:
+                return None
+            flat += position * stride
+        return str(self.classes[self.codes[flat]])
+
+    def save(self, path=DEFAULT_TABLE_PATH):
+        meta = json.dumps({"axes": [axis.to_dict() for axis in self.axes], "model_fingerprint": self.model_fingerprint})
+        np.savez_compressed(path, codes=self.codes, classes=self.classes.astype(str), meta=np.array(meta))
+
+    @classmethod
+    def load(cls, path=DEFAULT_TABLE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            axes = [axis_from_dict(axis) for axis in meta["axes"]]
+            return cls(axes, data["codes"], data["classes"], meta.get("model_fingerprint"))
+
+
+def grid_frame(axes, flat_indices):
+    """Builds the model input DataFrame for the given flat grid positions."""
+    import pandas as pd
+    positions = np.unravel_index(flat_indices, tuple(len(axis) for axis in axes))
+    columns = {axis.name: axis.materialize(position) for axis, position in zip(axes, positions)}
+    columns['Cout_de_la_Vie'] = np.full(len(flat_indices), COST_OF_LIVING_PLACEHOLDER)
+    return pd.DataFrame(columns)[FEATURE_COLUMNS]
+
+
+def build_table(preprocessor, model, label_encoder, axes=None, batch_size=50000):
+    axes = axes or default_axes()
+    size = int(np.prod([len(axis) for axis in axes]))
+    classes = np.asarray(label_encoder.classes_)
+    codes = np.empty(size, dtype=np.uint8 if len(classes) <= 256 else np.uint16)
+    for start in range(0, size, batch_size):
+        stop = min(start + batch_size, size)
+        frame = grid_frame(axes, np.arange(start, stop))
+        codes[start:stop] = model.predict(preprocessor.transform(frame))
+    return RecommendationTable(axes, codes, classes)
+
+
+def agreement_rate(table, preprocessor, model, label_encoder, samples=2000, seed=42):
+    """Fraction of random in-range requests (unbucketed budgets) where the table matches the live model."""
+    import pandas as pd
+    rng = random.Random(seed)
+    records = [
+        {
+            'Age': rng.randint(18, 70),
+            'Budget': rng.randint(1000, 8000),
+            'Interet': rng.choice(INTERESTS),
+            'Duree': rng.randint(3, 21),
+            'Climat': rng.choice(CLIMATES),
+            'Continent': rng.choice(CONTINENTS),
+            'Type_Destination': rng.choice(DESTINATION_TYPES),
+        }
+        for _ in range(samples)
+    ]
+    frame = pd.DataFrame(records)
+    frame['Cout_de_la_Vie'] = COST_OF_LIVING_PLACEHOLDER
+    live = label_encoder.inverse_transform(model.predict(preprocessor.transform(frame[FEATURE_COLUMNS])))
+    matches = sum(table.lookup(SimpleNamespace(**record)) == expected for record, expected in zip(records, live))
+    return matches / samples
+
+
+def build_and_report(preprocessor, model, label_encoder, fingerprint, path=DEFAULT_TABLE_PATH, age_step=1, duration_step=1, budget_step=500, samples=2000):
+    start = time.perf_counter()
+    axes = default_axes(age_step=age_step, duration_step=duration_step, budget_step=budget_step)
+    table = build_table(preprocessor, model, label_encoder, axes=axes)
+    table.model_fingerprint = fingerprint
+    build_seconds = time.perf_counter() - start
+    table.save(path)
+    return {
+        "path": path,
+        "entries": table.size,
+        "bytes": table.nbytes,
+        "build_seconds": round(build_seconds, 2),
+        "agreement_rate": round(agreement_rate(table, preprocessor, model, label_encoder, samples=samples), 4),
+    }
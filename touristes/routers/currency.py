@@ -3,6 +3,8 @@ import requests
 import os
 from cachetools import TTLCache
 
+import metrics
+
 router = APIRouter(
     prefix="/api/currency",
     tags=["currency"],
@@ -13,16 +15,20 @@ currency_cache = TTLCache(maxsize=10, ttl=3600)
 @router.get("/rates")
 async def get_currency_rates():
     cache_key = "currency_rates_USD"
-    if cache_key in currency_cache:
-        return currency_cache[cache_key]
+    cached = currency_cache.get(cache_key)
+    metrics.record_cache("currency_rates", hit=cached is not None)
+    if cached is not None:
+        return cached
 
     api_key = os.environ.get("EXCHANGE_RATE_API_KEY", "YOUR_API_KEY")
     if api_key == "YOUR_API_KEY":
         raise HTTPException(status_code=500, detail="API key for currency conversion is not configured.")
 
-    url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/USD"
+    base_url = os.environ.get("EXCHANGE_RATE_API_URL", "https://v6.exchangerate-api.com/v6")
+    url = f"{base_url}/{api_key}/latest/USD"
     try:
-        response = requests.get(url)
+        with metrics.stage("currency_fetch"):
+            response = requests.get(url)
         response.raise_for_status()
         data = response.json()
         if data.get("result") == "success":
@@ -37,7 +43,10 @@ async def get_currency_rates():
 async def convert_currency(amount: float, from_currency: str, to_currency: str):
     cache_key = "currency_rates_USD"
 
-    if cache_key not in currency_cache:
+    if cache_key in currency_cache:
+        metrics.record_cache("currency_rates", hit=True)
+    else:
+        # Records the miss itself
         await get_currency_rates()
 
     rates_data = currency_cache.get(cache_key)
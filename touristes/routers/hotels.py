@@ -1,23 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal
+from datetime import date
+import codecs
 
-# Correctly import from the top-level modules
-from .. import crud, schemas, database
-from ..main import get_db, get_current_user
+import crud, schemas, database, ingest
+from deps import get_db, get_current_user, get_admin_user
 
 router = APIRouter(
     prefix="/api/hotels",
     tags=["hotels"],
 )
 
+# Database endpoints are plain functions so FastAPI runs them in its threadpool;
+# blocking on the connection pool from the event loop stalls every request.
 @router.get("/search", response_model=List[schemas.Hotel])
-async def search_hotels(destination: str, db: Session = Depends(get_db)):
-    hotels = crud.get_hotels_by_destination(db, destination=destination)
-    return hotels
+def search_hotels(destination: str, db: Session = Depends(get_db)):
+    return crud.get_hotels_by_destination(db, destination=destination)
 
 @router.post("/book", response_model=schemas.Booking)
-async def book_hotel(booking: schemas.BookingCreate, db: Session = Depends(get_db), current_user: database.User = Depends(get_current_user)):
+def book_hotel(booking: schemas.BookingCreate, db: Session = Depends(get_db), current_user: database.User = Depends(get_current_user)):
     if booking.end_date <= booking.start_date:
         raise HTTPException(status_code=400, detail="End date must be after start date.")
 
@@ -25,3 +28,42 @@ async def book_hotel(booking: schemas.BookingCreate, db: Session = Depends(get_d
     if error_msg:
         raise HTTPException(status_code=400, detail=error_msg)
     return db_booking
+
+@router.get("/bookings", response_model=schemas.BookingPage)
+def list_bookings(
+    scope: Literal["upcoming", "past"] = "upcoming",
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: database.User = Depends(get_current_user),
+):
+    after = None
+    if cursor:
+        # Cursor format: "<start_date>_<booking id>" of the last booking on the previous page
+        try:
+            start_date, booking_id = cursor.split("_")
+            after = (date.fromisoformat(start_date), int(booking_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    bookings = crud.get_user_bookings(db, user_id=current_user.id, upcoming=scope == "upcoming", today=date.today(), after=after, limit=limit + 1)
+    next_cursor = None
+    if len(bookings) > limit:
+        bookings = bookings[:limit]
+        last = bookings[-1]
+        next_cursor = f"{last.start_date.isoformat()}_{last.id}"
+    return {"items": bookings, "next_cursor": next_cursor}
+
+@router.post("/ingest")
+async def ingest_catalog(
+    file: UploadFile = File(...),
+    format: Literal["ndjson", "csv"] | None = None,
+    chunk_size: int = Query(ingest.CHUNK_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    admin: database.User = Depends(get_admin_user),
+):
+    # The upload is spooled to disk and decoded line by line, so memory stays
+    # bounded; the blocking database work runs off the event loop.
+    lines = codecs.iterdecode(file.file, "utf-8")
+    fmt = format or ingest.detect_format(file.filename)
+    return await run_in_threadpool(ingest.ingest_stream, db, lines, fmt, chunk_size)
@@ -1,17 +1,95 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from typing import Annotated
+
+import database, dispatch, metrics
+from deps import get_current_user, is_admin
 
 router = APIRouter(
     prefix="/api/taxis",
     tags=["taxis"],
 )
 
+# In-process state: serve the taxi routes from a single worker (see DriverIndex)
+driver_index = dispatch.DriverIndex()
+
+Latitude = Annotated[float, Field(ge=-90, le=90, allow_inf_nan=False)]
+Longitude = Annotated[float, Field(ge=-180, le=180, allow_inf_nan=False)]
+
 class TaxiBookingRequest(BaseModel):
     pickup: str
     destination: str
-    fare: float
+    pickup_lat: Latitude
+    pickup_lon: Longitude
+    destination_lat: Latitude
+    destination_lon: Longitude
+    # Ignored: the fare is estimated from the trip distance
+    fare: float | None = None
 
-# Note: This is a mock implementation.
+class DriverLocation(BaseModel):
+    lat: Latitude
+    lon: Longitude
+
+class RideCompletion(BaseModel):
+    lat: Latitude | None = None
+    lon: Longitude | None = None
+
+# Plain def: the claim waits on the index lock, which must not block the event loop
 @router.post("/book")
-async def book_taxi(booking: TaxiBookingRequest):
-    return {"message": f"Driver found for your ride from {booking.pickup} to {booking.destination}! Your ride is on the way."}
+def book_taxi(booking: TaxiBookingRequest, current_user: database.User = Depends(get_current_user)):
+    with metrics.stage("taxi_match"):
+        match = driver_index.claim_nearest(booking.pickup_lat, booking.pickup_lon, rider_id=current_user.username)
+    if match is None:
+        raise HTTPException(status_code=503, detail="No drivers available near your pickup location.")
+    ride_id, driver_id, pickup_km = match
+
+    trip_km = dispatch.haversine_km(booking.pickup_lat, booking.pickup_lon, booking.destination_lat, booking.destination_lon)
+    fare = dispatch.estimate_fare(trip_km)
+    return {
+        "message": f"Driver found for your ride from {booking.pickup} to {booking.destination}! Your ride is on the way.",
+        "ride_id": ride_id,
+        "driver_id": driver_id,
+        "pickup_distance_km": round(pickup_km, 3),
+        "trip_distance_km": round(trip_km, 3),
+        "fare": fare,
+    }
+
+def authorize_driver(driver_id: str, user: database.User):
+    # Drivers act as the user whose username is their driver id
+    if user.username != driver_id and not is_admin(user):
+        raise HTTPException(status_code=403, detail="Not allowed to act for this driver.")
+
+@router.put("/drivers/{driver_id}/location")
+async def update_driver_location(driver_id: str, location: DriverLocation, current_user: database.User = Depends(get_current_user)):
+    authorize_driver(driver_id, current_user)
+    driver_index.update_location(driver_id, location.lat, location.lon)
+    return {"driver_id": driver_id, "lat": location.lat, "lon": location.lon}
+
+@router.delete("/drivers/{driver_id}")
+async def remove_driver(driver_id: str, current_user: database.User = Depends(get_current_user)):
+    authorize_driver(driver_id, current_user)
+    if not driver_index.remove_driver(driver_id):
+        raise HTTPException(status_code=404, detail="Driver not found.")
+    return {"driver_id": driver_id, "removed": True}
+
+@router.post("/rides/{ride_id}/complete")
+async def complete_ride(ride_id: str, completion: RideCompletion, current_user: database.User = Depends(get_current_user)):
+    # Only the assigned driver (or an admin) can end a ride
+    driver_id = None if is_admin(current_user) else current_user.username
+    driver_id = driver_index.complete_ride(ride_id, driver_id, completion.lat, completion.lon)
+    if driver_id is None:
+        raise HTTPException(status_code=404, detail="No active ride with this id for this driver.")
+    return {"ride_id": ride_id, "driver_id": driver_id, "available": True}
+
+@router.post("/rides/{ride_id}/cancel")
+async def cancel_ride(ride_id: str, current_user: database.User = Depends(get_current_user)):
+    # Only the rider who booked the ride (or an admin) can cancel it
+    rider_id = None if is_admin(current_user) else current_user.username
+    driver_id = driver_index.cancel_ride(ride_id, rider_id)
+    if driver_id is None:
+        raise HTTPException(status_code=404, detail="No active ride with this id for this rider.")
+    return {"ride_id": ride_id, "cancelled": True}
+
+@router.get("/drivers/stats")
+async def driver_stats():
+    return driver_index.stats()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, constr
+from typing import List, Optional
 from datetime import date
 
 class UserCreate(BaseModel):
@@ -62,6 +62,17 @@ class Hotel(HotelBase):
     class Config:
         orm_mode = True
 
+# Schemas for supplier catalog ingestion
+# Upsert key for ingested records; an empty id would merge unrelated records
+SupplierId = constr(strip_whitespace=True, min_length=1)
+
+class RoomIngest(RoomBase):
+    supplier_id: SupplierId
+
+class HotelIngest(HotelBase):
+    supplier_id: SupplierId
+    rooms: List[RoomIngest] = []
+
 class BookingBase(BaseModel):
     room_id: int
     start_date: date
@@ -76,3 +87,24 @@ class Booking(BookingBase):
 
     class Config:
         orm_mode = True
+
+# Schemas for the booking history
+class BookingHotel(HotelBase):
+    id: int
+
+    class Config:
+        orm_mode = True
+
+class BookingRoom(RoomBase):
+    id: int
+    hotel: BookingHotel
+
+    class Config:
+        orm_mode = True
+
+class BookingDetail(Booking):
+    room: BookingRoom
+
+class BookingPage(BaseModel):
+    items: List[BookingDetail]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class StartupProfile:
+    """
+    Records the state and duration of each named startup phase so the
+    health probes and the startup report can tell what has finished.
+    """
+
+    def __init__(self, phases):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._phases = {name: {"status": PENDING, "attempts": 0, "seconds": None, "error": None} for name in phases}
+
+    def run(self, name, func, retries=0, retry_delay=1.0):
+        """
+        Runs `func` as the phase `name`, retrying up to `retries` times.
+        Returns True when the phase finished, False when it gave up.
+        """
+        self._update(name, status=RUNNING)
+        start = time.perf_counter()
+        for attempt in range(1, retries + 2):
+            self._update(name, attempts=attempt)
+            try:
+                func()
+            except Exception as e:
+                logger.warning("Startup phase %r failed (attempt %d): %s", name, attempt, e)
+                self._update(name, error=str(e))
+                if attempt <= retries:
+                    time.sleep(retry_delay)
+                    # Back off, but keep probing often enough to recover quickly
+                    retry_delay = min(retry_delay * 2, 30.0)
+                continue
+            self._update(name, status=DONE, seconds=time.perf_counter() - start, error=None)
+            logger.info("Startup phase %r done in %.3fs", name, time.perf_counter() - start)
+            return True
+        self._update(name, status=FAILED, seconds=time.perf_counter() - start)
+        return False
+
+    def is_done(self, *names):
+        with self._lock:
+            return all(self._phases[name]["status"] == DONE for name in names)
+
+    def status(self, name):
+        with self._lock:
+            return self._phases[name]["status"]
+
+    def report(self):
+        with self._lock:
+            phases = {name: dict(state) for name, state in self._phases.items()}
+        return {
+            "uptime_seconds": round(time.perf_counter() - self._started, 3),
+            "complete": all(state["status"] == DONE for state in phases.values()),
+            "phases": phases,
+        }
+
+    def _update(self, name, **fields):
+        with self._lock:
+            if "seconds" in fields and fields["seconds"] is not None:
+                fields["seconds"] = round(fields["seconds"], 4)
+            self._phases[name].update(fields)
@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+# database.py builds its engine at import time; always point the tests at a
+# throwaway SQLite file, never at a configured server.
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+import random
+
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+
+import database
+import recommendation_table as rt
+
+
+@pytest.fixture
+def db():
+    database.Base.metadata.create_all(bind=database.engine)
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        database.Base.metadata.drop_all(bind=database.engine)
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    import main
+    # Not entered as a context manager: the lifespan would load the real
+    # artifacts, so each test sets up the startup state it needs.
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def auth_headers(client):
+    def login(username):
+        client.post("/signup/", json={"username": username, "email": f"{username}@test.local", "password": "secret"})
+        token = client.post("/token", data={"username": username, "password": "secret"}).json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+    return login
+
+
+@pytest.fixture(scope="session")
+def live_model():
+    rng = random.Random(0)
+    records = [
+        {
+            'Age': rng.randint(18, 70),
+            'Budget': rng.randint(1000, 8000),
+            'Interet': rng.choice(rt.INTERESTS),
+            'Duree': rng.randint(3, 21),
+            'Climat': rng.choice(rt.CLIMATES),
+            'Continent': rng.choice(rt.CONTINENTS),
+            'Cout_de_la_Vie': rt.COST_OF_LIVING_PLACEHOLDER,
+            'Type_Destination': rng.choice(rt.DESTINATION_TYPES),
+        }
+        for _ in range(300)
+    ]
+    frame = pd.DataFrame(records)[rt.FEATURE_COLUMNS]
+    destinations = [rng.choice(['Paris', 'Tokyo', 'Bali', 'Rome']) for _ in records]
+
+    preprocessor = ColumnTransformer([
+        ('num', StandardScaler(), ['Age', 'Budget', 'Duree']),
+        ('cat', OneHotEncoder(handle_unknown='ignore'), ['Interet', 'Climat', 'Continent', 'Type_Destination']),
+    ])
+    label_encoder = LabelEncoder()
+    model = KNeighborsClassifier(n_neighbors=3)
+    model.fit(preprocessor.fit_transform(frame), label_encoder.fit_transform(destinations))
+    return preprocessor, model, label_encoder
@@ -0,0 +1,113 @@
+import math
+import random
+import threading
+import time
+
+import dispatch
+
+
+def brute_force_nearest(drivers, lat, lon, max_radius_km):
+    best = None
+    for driver_id, (driver_lat, driver_lon) in drivers.items():
+        distance = dispatch.haversine_km(lat, lon, driver_lat, driver_lon)
+        if distance <= max_radius_km and (best is None or distance < best[1]):
+            best = (driver_id, distance)
+    return best
+
+
+def random_fleet(rng, count):
+    return {f"driver-{i}": (rng.uniform(48.80, 48.91), rng.uniform(2.25, 2.42)) for i in range(count)}
+
+
+def test_km_per_degree_matches_earth_radius():
+    assert math.isclose(dispatch.KM_PER_DEGREE_LAT, dispatch.haversine_km(0, 0, 1, 0))
+
+
+def test_claim_nearest_matches_brute_force():
+    rng = random.Random(7)
+    available = random_fleet(rng, 500)
+    index = dispatch.DriverIndex(cell_size_deg=0.01)
+    for driver_id, (lat, lon) in available.items():
+        index.update_location(driver_id, lat, lon)
+
+    for _ in range(300):
+        lat, lon = rng.uniform(48.78, 48.93), rng.uniform(2.23, 2.44)
+        max_radius_km = rng.choice([0.5, 2.0, 5.0])
+        expected = brute_force_nearest(available, lat, lon, max_radius_km)
+        match = index.claim_nearest(lat, lon, max_radius_km=max_radius_km)
+        if expected is None:
+            assert match is None
+            continue
+        _, driver_id, distance = match
+        assert math.isclose(distance, expected[1])
+        del available[driver_id]
+
+
+def test_concurrent_claims_never_share_a_driver():
+    rng = random.Random(11)
+    index = dispatch.DriverIndex()
+    for driver_id, (lat, lon) in random_fleet(rng, 200).items():
+        index.update_location(driver_id, lat, lon)
+    claims = [[] for _ in range(8)]
+
+    def worker(i):
+        local_rng = random.Random(i)
+        for _ in range(50):
+            match = index.claim_nearest(local_rng.uniform(48.80, 48.91), local_rng.uniform(2.25, 2.42), max_radius_km=20)
+            if match is not None:
+                claims[i].append(match[1])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    claimed = [driver_id for worker_claims in claims for driver_id in worker_claims]
+    assert len(claimed) == 200
+    assert len(set(claimed)) == 200
+    assert index.stats()["available"] == 0
+
+
+def test_complete_ride_requires_the_assigned_driver():
+    index = dispatch.DriverIndex()
+    index.update_location("alice", 48.85, 2.35)
+    index.update_location("bob", 48.90, 2.40)
+    ride_id, driver_id, _ = index.claim_nearest(48.85, 2.35)
+    assert driver_id == "alice"
+
+    assert index.complete_ride(ride_id, driver_id="bob") is None
+    assert index.complete_ride("unknown-ride") is None
+    assert index.complete_ride(ride_id, driver_id="alice", lat=48.90, lon=2.40) == "alice"
+    # A ride can only be completed once
+    assert index.complete_ride(ride_id) is None
+    assert index.stats()["available"] == 2
+
+
+def test_removed_driver_ride_cannot_be_completed():
+    index = dispatch.DriverIndex()
+    index.update_location("alice", 48.85, 2.35)
+    ride_id, _, _ = index.claim_nearest(48.85, 2.35)
+    assert index.remove_driver("alice")
+    assert index.complete_ride(ride_id) is None
+    assert index.stats() == {"drivers": 0, "available": 0, "rides": 0, "cells": 0}
+
+
+def test_cancel_ride_requires_the_rider_who_booked_it():
+    index = dispatch.DriverIndex()
+    index.update_location("alice", 48.85, 2.35)
+    ride_id, _, _ = index.claim_nearest(48.85, 2.35, rider_id="carol")
+
+    assert index.cancel_ride(ride_id, rider_id="dave") is None
+    assert index.cancel_ride(ride_id, rider_id="carol") == "alice"
+    assert index.complete_ride(ride_id) is None
+    assert index.stats()["available"] == 1
+
+
+def test_search_near_the_pole_is_bounded():
+    index = dispatch.DriverIndex()
+    index.update_location("polar", 89.905, 0.0)
+    start = time.perf_counter()
+    assert index.claim_nearest(89.9, 0.0, max_radius_km=5.0)[1] == "polar"
+    assert index.claim_nearest(89.9, 0.0, max_radius_km=5.0) is None
+    assert time.perf_counter() - start < 0.1
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def bookings(db, client, auth_headers):
+    headers = auth_headers("traveler")
+    user = db.query(database.User).filter_by(username="traveler").one()
+    hotel = database.Hotel(name="Hotel One", destination="Paris", rating=4)
+    room = database.Room(hotel=hotel, room_type="Double", price=100.0, availability=5)
+    today = date.today()
+    # Two bookings share each start date so the pages must break ties on id
+    starts = [today - timedelta(days=30)] * 2 + [today - timedelta(days=10)] + [today + timedelta(days=5)] * 2 + [today + timedelta(days=20)]
+    db.add_all([database.Booking(user=user, room=room, start_date=start, end_date=start + timedelta(days=3)) for start in starts])
+    db.commit()
+    ordered = db.query(database.Booking).order_by(database.Booking.start_date, database.Booking.id).all()
+    return headers, [(booking.start_date, booking.id) for booking in ordered]
+
+
+def fetch_all(client, headers, scope, limit):
+    pages, cursor = [], None
+    while True:
+        params = {"scope": scope, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/hotels/bookings", params=params, headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        pages.append([(date.fromisoformat(item["start_date"]), item["id"]) for item in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_upcoming_pages_run_oldest_first_with_ties_broken_on_id(client, bookings):
+    headers, ordered = bookings
+    pages = fetch_all(client, headers, "upcoming", limit=2)
+
+    assert pages == [ordered[3:5], ordered[5:]]
+
+
+def test_past_pages_run_newest_first_with_ties_broken_on_id(client, bookings):
+    headers, ordered = bookings
+    pages = fetch_all(client, headers, "past", limit=1)
+
+    assert pages == [[key] for key in reversed(ordered[:3])]
+
+
+def test_next_cursor_only_when_a_further_row_exists(client, bookings):
+    headers, ordered = bookings
+    page = client.get("/api/hotels/bookings", params={"scope": "past", "limit": 3}, headers=headers).json()
+    assert len(page["items"]) == 3
+    assert page["next_cursor"] is None
+
+    page = client.get("/api/hotels/bookings", params={"scope": "past", "limit": 2}, headers=headers).json()
+    start_date, booking_id = ordered[1]
+    assert page["next_cursor"] == f"{start_date.isoformat()}_{booking_id}"
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "2024-01-01", "2024-13-01_4", "2024-01-01_x", "2024-01-01_4_5"])
+def test_invalid_cursor_is_rejected(client, bookings, cursor):
+    headers, _ = bookings
+    response = client.get("/api/hotels/bookings", params={"cursor": cursor}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
@@ -0,0 +1,125 @@
+import json
+
+from sqlalchemy import text
+
+import database
+import ingest
+
+
+def hotel_line(supplier_id, rooms=(), **fields):
+    record = {'supplier_id': supplier_id, 'name': f"Hotel {supplier_id}", 'destination': "Paris", 'rating': 4, **fields}
+    record['rooms'] = [
+        {'supplier_id': room_id, 'room_type': room_type, 'price': 100.0, 'availability': 3}
+        for room_id, room_type in rooms
+    ]
+    return json.dumps(record)
+
+
+def test_parse_csv_groups_consecutive_rows_by_hotel():
+    lines = [
+        "supplier_id,name,destination,rating,room_supplier_id,room_type,price,availability\n",
+        "H1,Hotel One,Paris,5,H1-R1,Double,120,4\n",
+        "H1,Hotel One,Paris,5,H1-R2,Suite,300,1\n",
+        "H2,Hotel Two,Rome,4,,,,\n",
+        "H3,Hotel Three,Tokyo,3,H3-R1,Single,80,2\n",
+    ]
+    records = list(ingest.parse_csv(lines))
+
+    assert [line for line, _ in records] == [2, 4, 5]
+    assert [record['supplier_id'] for _, record in records] == ['H1', 'H2', 'H3']
+    assert [room['supplier_id'] for room in records[0][1]['rooms']] == ['H1-R1', 'H1-R2']
+    assert records[1][1]['rooms'] == []
+    assert records[2][1]['rooms'][0] == {'supplier_id': 'H3-R1', 'room_type': 'Single', 'price': '80', 'availability': '2'}
+
+
+def test_ingest_counts_inserts_then_updates(db):
+    feed = [
+        hotel_line('H1', [('H1-R1', 'Double'), ('H1-R2', 'Suite')]),
+        hotel_line('H2', [('H2-R1', 'Single')]),
+    ]
+    report = ingest.ingest_stream(db, feed, 'ndjson', chunk_size=10)
+    assert (report['hotels_inserted'], report['hotels_updated']) == (2, 0)
+    assert (report['rooms_inserted'], report['rooms_updated']) == (3, 0)
+    assert report['rows_rejected'] == 0
+
+    feed = [
+        hotel_line('H1', [('H1-R1', 'Double'), ('H1-R3', 'Family')], rating=5),
+        hotel_line('H3'),
+    ]
+    report = ingest.ingest_stream(db, feed, 'ndjson', chunk_size=10)
+    assert (report['hotels_inserted'], report['hotels_updated']) == (1, 1)
+    assert (report['rooms_inserted'], report['rooms_updated']) == (1, 1)
+    assert db.query(database.Hotel).filter_by(supplier_id='H1').one().rating == 5
+    assert db.query(database.Room).count() == 4
+
+
+def test_invalid_records_are_rejected_with_their_rows(db):
+    feed = [
+        hotel_line('H1', [('H1-R1', 'Double')]),
+        "{not json",
+        hotel_line('H2', [('H2-R1', 'Double'), ('H2-R1', 'Suite')]),
+        hotel_line('H3', [('H3-R1', 'Double')], rating="five"),
+    ]
+    report = ingest.ingest_stream(db, feed, 'ndjson')
+
+    assert report['hotels_inserted'] == 1
+    assert report['rows_rejected'] == 1 + 3 + 2
+    assert [error['line'] for error in report['errors']] == [2, 3, 4]
+
+
+def test_failed_write_rejects_only_the_bad_hotel(db):
+    # Make the database refuse one specific room so the failure surfaces on write
+    db.execute(text(
+        "CREATE TRIGGER reject_bad_room BEFORE INSERT ON rooms WHEN NEW.room_type = 'Broken' "
+        "BEGIN SELECT RAISE(ABORT, 'room rejected by database'); END"
+    ))
+    db.commit()
+    feed = [hotel_line(f'H{i}', [(f'H{i}-R1', 'Double')]) for i in range(1, 8)]
+    feed[4] = hotel_line('H5', [('H5-R1', 'Double'), ('H5-R2', 'Broken')])
+
+    report = ingest.ingest_stream(db, feed, 'ndjson', chunk_size=100)
+
+    assert report['hotels_inserted'] == 6
+    assert report['rooms_inserted'] == 6
+    assert report['rows_rejected'] == 3
+    assert len(report['errors']) == 1
+    assert report['errors'][0]['line'] == 5
+    assert 'room rejected by database' in report['errors'][0]['error']
+    assert db.query(database.Hotel).filter_by(supplier_id='H5').first() is None
+
+
+CSV_HEADER = "supplier_id,name,destination,rating,room_supplier_id,room_type,price,availability\n"
+
+
+def test_parse_csv_rejects_conflicting_and_keyless_rows():
+    lines = [
+        CSV_HEADER,
+        "H1,Hotel One,Paris,5,H1-R1,Double,120,4\n",
+        "H1,Hotel Uno,Paris,5,H1-R2,Suite,300,1\n",
+        "H1,Hotel One,Paris,5,,Single,80,2\n",
+    ]
+    records = list(ingest.parse_csv(lines))
+
+    rejected = [(line, record.reason) for line, record in records if isinstance(record, ingest.RejectedRow)]
+    assert [line for line, _ in rejected] == [3, 4]
+    hotels = [record for _, record in records if not isinstance(record, ingest.RejectedRow)]
+    assert [room['supplier_id'] for room in hotels[0]['rooms']] == ['H1-R1']
+
+
+def test_empty_supplier_ids_are_rejected(db):
+    lines = [
+        CSV_HEADER,
+        ",Hotel A,Paris,4,A-R1,Double,100,2\n",
+        ",Hotel B,Rome,4,B-R1,Double,100,2\n",
+        "H2,Hotel Two,Rome,4,,,,\n",
+    ]
+    report = ingest.ingest_stream(db, lines, 'csv')
+
+    assert report['hotels_inserted'] == 1
+    assert report['rows_rejected'] == 3
+    assert db.query(database.Hotel).filter_by(supplier_id='').first() is None
+
+    feed = [hotel_line(' '), hotel_line('H3', [('', 'Double')])]
+    report = ingest.ingest_stream(db, feed, 'ndjson')
+    assert report['hotels_inserted'] == 0
+    assert report['rows_rejected'] == 1 + 2
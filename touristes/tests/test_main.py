@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import main
+import recommendation_table as rt
+from startup import StartupProfile
+
+REQUEST = {'Age': 44, 'Budget': 4500, 'Interet': 'Culture', 'Duree': 12, 'Climat': 'Chaud', 'Continent': 'Europe', 'Type_Destination': 'Ile'}
+
+
+@pytest.fixture
+def loaded_models(live_model, monkeypatch):
+    preprocessor, model, label_encoder = live_model
+    axes = rt.default_axes(age_step=26, duration_step=9, budget_step=3500)
+    models = {
+        'model': model,
+        'preprocessor': preprocessor,
+        'label_encoder': label_encoder,
+        'table': rt.build_table(preprocessor, model, label_encoder, axes=axes),
+    }
+    profile = StartupProfile(["schema", "models"])
+    profile.run("schema", lambda: None)
+    profile.run("models", lambda: None)
+    monkeypatch.setattr(main, "ml_models", models)
+    monkeypatch.setattr(main, "startup_profile", profile)
+    return models
+
+
+def live_prediction(models, request):
+    frame = pd.DataFrame([{**request, 'Cout_de_la_Vie': rt.COST_OF_LIVING_PLACEHOLDER}])[rt.FEATURE_COLUMNS]
+    encoded = models['model'].predict(models['preprocessor'].transform(frame))
+    return models['label_encoder'].inverse_transform(encoded)[0]
+
+
+def test_recommend_serves_grid_inputs_from_the_table(client, auth_headers, loaded_models):
+    response = client.post("/recommend/", json=REQUEST, headers=auth_headers("traveler"))
+
+    assert response.status_code == 200
+    assert loaded_models['table'].lookup(SimpleNamespace(**REQUEST)) in response.text
+    assert "table_lookup" in response.headers["Server-Timing"]
+    assert "predict" not in response.headers["Server-Timing"]
+
+
+def test_recommend_falls_back_to_the_live_model_off_grid(client, auth_headers, loaded_models):
+    request = {**REQUEST, 'Budget': 9000}
+    response = client.post("/recommend/", json=request, headers=auth_headers("traveler"))
+
+    assert response.status_code == 200
+    assert live_prediction(loaded_models, request) in response.text
+    assert "predict" in response.headers["Server-Timing"]
+
+
+@pytest.mark.parametrize("path", ["/", "/login", "/hotels", "/currency", "/taxis"])
+def test_pages_render(client, path):
+    assert client.get(path).status_code == 200
+
+
+def test_unhandled_errors_are_recorded_as_500(client, monkeypatch):
+    import crud
+    from fastapi.testclient import TestClient
+
+    def fail(db, destination):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(crud, "get_hotels_by_destination", fail)
+    response = TestClient(main.app, raise_server_exceptions=False).get("/api/hotels/search", params={"destination": "Paris"})
+
+    assert response.status_code == 500
+    assert 'app_request_duration_seconds_count{method="GET",route="/api/hotels/search",status="500"} 1' in client.get("/metrics").text
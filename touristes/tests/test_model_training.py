@@ -0,0 +1,91 @@
+import random
+
+import joblib
+import pytest
+from sqlalchemy import create_engine, insert
+
+import database
+import model_training
+
+DESTINATIONS = [
+    {'id': 1, 'name': 'Paris', 'continent': 'Europe', 'cost_of_living': 1.4, 'destination_type': 'Megalopole'},
+    {'id': 2, 'name': 'Bali', 'continent': 'Asie', 'cost_of_living': 0.6, 'destination_type': 'Ile'},
+    {'id': 3, 'name': 'Rome', 'continent': 'Europe', 'cost_of_living': 1.1, 'destination_type': 'Historique'},
+]
+
+
+@pytest.fixture
+def training_db(tmp_path, monkeypatch):
+    # Artifacts are written to the working directory
+    monkeypatch.chdir(tmp_path)
+    engine = create_engine(f"sqlite:///{tmp_path / 'train.db'}")
+    tables = [database.Destination.__table__, database.TourismeData.__table__]
+    database.Base.metadata.create_all(bind=engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(insert(database.Destination.__table__), DESTINATIONS)
+    yield engine
+    engine.dispose()
+
+
+def add_rows(engine, count, seed):
+    rng = random.Random(seed)
+    rows = [
+        {
+            'age': rng.randint(18, 70),
+            'budget': rng.randint(1000, 8000),
+            'interest': rng.choice(['Culture', 'Plage', 'Histoire']),
+            'duration': rng.randint(3, 21),
+            'climate': rng.choice(['Chaud', 'Tempéré']),
+            # Every destination appears in both the train and the test split
+            'destination_id': i % len(DESTINATIONS) + 1,
+        }
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(database.TourismeData.__table__), rows)
+
+
+def fitted_rows():
+    return joblib.load('recommendation_model.joblib')._fit_X.shape[0]
+
+
+def test_incremental_run_appends_a_delta_exactly_once(training_db):
+    add_rows(training_db, 150, seed=1)
+    model_training.train_full(training_db)
+    rows = fitted_rows()
+    stale_state = model_training.load_state()
+    assert stale_state['rows'] == rows
+
+    add_rows(training_db, 12, seed=2)
+    assert model_training.train_incremental(training_db, model_training.load_state()) == model_training.UPDATED
+    assert fitted_rows() == rows + 12
+    assert joblib.load('recommendation_model.joblib').high_water_mark_ == 162
+
+    # A rerun, even one holding the state from before the update (as after a
+    # crash between publishing the model and saving the state), finds nothing new
+    assert model_training.train_incremental(training_db, model_training.load_state()) == model_training.UNCHANGED
+    assert model_training.train_incremental(training_db, stale_state) == model_training.UNCHANGED
+    assert fitted_rows() == rows + 12
+
+
+def test_incremental_run_keeps_the_existing_labels(training_db):
+    add_rows(training_db, 150, seed=1)
+    model_training.train_full(training_db)
+    X_before, y_before = model_training.fitted_training_set(joblib.load('recommendation_model.joblib'))
+
+    add_rows(training_db, 6, seed=3)
+    model_training.train_incremental(training_db, model_training.load_state())
+    X_after, y_after = model_training.fitted_training_set(joblib.load('recommendation_model.joblib'))
+
+    assert list(y_after[:len(y_before)]) == list(y_before)
+    assert (X_after[:len(X_before)] == X_before).all()
+
+
+def test_model_without_a_mark_needs_a_full_rebuild(training_db):
+    add_rows(training_db, 150, seed=1)
+    model_training.train_full(training_db)
+    model = joblib.load('recommendation_model.joblib')
+    del model.high_water_mark_
+    joblib.dump(model, 'recommendation_model.joblib')
+
+    assert model_training.train_incremental(training_db, model_training.load_state()) == model_training.NEEDS_FULL_REBUILD
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+import recommendation_table as rt
+
+
+def test_numeric_axis_snaps_to_nearest_with_halves_rounding_up():
+    axis = rt.NumericAxis('Budget', 1000, 8000, 500)
+    assert axis.index(1000) == 0
+    assert axis.index(1249) == 0
+    assert axis.index(1250) == 1
+    assert axis.index(1750) == 2
+    assert axis.index(8000) == len(axis) - 1
+
+
+def test_numeric_axis_rejects_values_outside_range():
+    axis = rt.NumericAxis('Budget', 1000, 8000, 500)
+    assert axis.index(760) is None
+    assert axis.index(999.9) is None
+    assert axis.index(8000.1) is None
+    assert axis.index(8240) is None
+
+
+def test_numeric_axis_clamps_when_stop_is_off_grid():
+    axis = rt.NumericAxis('Age', 18, 70, 20)
+    assert len(axis) == 3
+    assert axis.index(70) == 2
+    assert axis.materialize(np.array([axis.index(70)]))[0] == 58
+
+
+def test_table_matches_live_model_on_grid_points(live_model, tmp_path):
+    preprocessor, model, label_encoder = live_model
+    axes = rt.default_axes(age_step=26, duration_step=9, budget_step=3500)
+    table = rt.build_table(preprocessor, model, label_encoder, axes=axes)
+    table.model_fingerprint = rt.model_fingerprint(b'model')
+    path = tmp_path / 'table.npz'
+    table.save(path)
+    table = rt.RecommendationTable.load(path)
+    assert table.model_fingerprint == rt.model_fingerprint(b'model')
+
+    flat = np.random.default_rng(0).choice(table.size, size=500, replace=False)
+    frame = rt.grid_frame(axes, flat)
+    expected = label_encoder.inverse_transform(model.predict(preprocessor.transform(frame)))
+    for record, destination in zip(frame.to_dict('records'), expected):
+        assert table.lookup(SimpleNamespace(**record)) == destination
+
+
+def test_table_lookup_outside_grid_returns_none(live_model):
+    preprocessor, model, label_encoder = live_model
+    axes = rt.default_axes(age_step=26, duration_step=9, budget_step=3500)
+    table = rt.build_table(preprocessor, model, label_encoder, axes=axes)
+    request = dict(Age=30, Budget=3000, Interet='Culture', Duree=7, Climat='Chaud', Continent='Europe', Type_Destination='Ile')
+    assert table.lookup(SimpleNamespace(**request)) is not None
+    assert table.lookup(SimpleNamespace(**{**request, 'Budget': 9000})) is None
+    assert table.lookup(SimpleNamespace(**{**request, 'Interet': 'Unknown'})) is None
@@ -0,0 +1,62 @@
+import pytest
+
+import startup
+from startup import StartupProfile
+
+
+def failing(times):
+    calls = []
+
+    def run():
+        calls.append(1)
+        if len(calls) <= times:
+            raise RuntimeError(f"attempt {len(calls)} failed")
+    return run, calls
+
+
+def test_run_marks_phase_done():
+    profile = StartupProfile(["schema"])
+    assert profile.status("schema") == startup.PENDING
+
+    assert profile.run("schema", lambda: None)
+    state = profile.report()["phases"]["schema"]
+    assert state["status"] == startup.DONE
+    assert state["attempts"] == 1
+    assert profile.is_done("schema")
+
+
+def test_run_retries_until_success(monkeypatch):
+    monkeypatch.setattr(startup.time, "sleep", lambda seconds: None)
+    profile = StartupProfile(["schema"])
+    func, calls = failing(2)
+
+    assert profile.run("schema", func, retries=3)
+    state = profile.report()["phases"]["schema"]
+    assert len(calls) == 3
+    assert (state["status"], state["attempts"], state["error"]) == (startup.DONE, 3, None)
+
+
+def test_run_fails_after_exhausting_retries(monkeypatch):
+    delays = []
+    monkeypatch.setattr(startup.time, "sleep", delays.append)
+    profile = StartupProfile(["schema", "models"])
+    func, calls = failing(10)
+
+    assert not profile.run("schema", func, retries=2, retry_delay=1.0)
+    state = profile.report()["phases"]["schema"]
+    assert len(calls) == 3
+    assert delays == [1.0, 2.0]
+    assert (state["status"], state["error"]) == (startup.FAILED, "attempt 3 failed")
+    assert not profile.report()["complete"]
+
+
+@pytest.mark.parametrize("schema, expected", [(lambda: None, 200), (failing(1)[0], 503)])
+def test_liveness_fails_once_a_phase_has_failed(client, monkeypatch, schema, expected):
+    import main
+    profile = StartupProfile(["schema", "models"])
+    profile.run("schema", schema)
+    monkeypatch.setattr(main, "startup_profile", profile)
+
+    response = client.get("/health/live")
+    assert response.status_code == expected
+    assert client.get("/health/ready").status_code == 503
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+import dispatch
+from routers import taxis
+
+BOOKING = {
+    "pickup": "Louvre", "destination": "Gare du Nord",
+    "pickup_lat": 48.8606, "pickup_lon": 2.3376,
+    "destination_lat": 48.8809, "destination_lon": 2.3553,
+}
+
+
+@pytest.fixture
+def driver_index(monkeypatch):
+    index = dispatch.DriverIndex()
+    index.update_location("driver1", 48.86, 2.34)
+    monkeypatch.setattr(taxis, "driver_index", index)
+    return index
+
+
+def test_booking_requires_authentication(client, driver_index):
+    assert client.post("/api/taxis/book", json=BOOKING).status_code == 401
+    assert driver_index.stats()["available"] == 1
+
+
+def test_only_the_rider_can_cancel_a_ride(client, auth_headers, driver_index):
+    rider, other = auth_headers("rider"), auth_headers("other")
+    response = client.post("/api/taxis/book", json=BOOKING, headers=rider)
+    assert response.status_code == 200
+    ride_id = response.json()["ride_id"]
+    assert driver_index.stats()["available"] == 0
+
+    assert client.post(f"/api/taxis/rides/{ride_id}/cancel", headers=other).status_code == 404
+    assert client.post(f"/api/taxis/rides/{ride_id}/cancel", headers=rider).json() == {"ride_id": ride_id, "cancelled": True}
+    assert driver_index.stats()["available"] == 1
+
+
+@pytest.mark.parametrize("field, value", [("pickup_lat", "NaN"), ("pickup_lat", "Infinity"), ("pickup_lat", "91"), ("pickup_lon", "-180.5")])
+def test_booking_rejects_invalid_coordinates(client, auth_headers, driver_index, field, value):
+    # Python's json module reads NaN and Infinity, so send them in the raw body
+    body = json.dumps({**BOOKING, field: "VALUE"}).replace('"VALUE"', value)
+    response = client.post("/api/taxis/book", content=body, headers={**auth_headers("rider"), "Content-Type": "application/json"})
+    assert response.status_code == 422
+    assert driver_index.stats()["available"] == 1
+
+
+def test_driver_location_rejects_out_of_range_latitude(client, auth_headers, driver_index):
+    response = client.put("/api/taxis/drivers/driver1/location", json={"lat": 95, "lon": 2.3}, headers=auth_headers("driver1"))
+    assert response.status_code == 422